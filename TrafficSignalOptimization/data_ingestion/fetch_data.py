@@ -5,12 +5,43 @@ Fetches traffic data from NYS Traffic Data Viewer OData Endpoint.
 
 import requests
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 import time
+import pandas as pd
+
+try:
+    import httpx
+except ImportError:
+    # httpx is optional; without it we fall back to requests (HTTP/1.1)
+    httpx = None
 
 logger = logging.getLogger(__name__)
 
+# Errors any of the supported HTTP clients can raise on a failed fetch
+if httpx is not None:
+    _REQUEST_ERRORS = (requests.RequestException, httpx.HTTPError)
+else:
+    _REQUEST_ERRORS = (requests.RequestException,)
+
+
+@lru_cache(maxsize=8192)
+def _timestamp_to_epoch(value: str) -> Optional[int]:
+    """
+    Parse an ISO-style timestamp string to Unix epoch seconds.
+
+    Cached because NYS feed records repeat the same date string many
+    times (daily aggregates), so most lookups are dict hits rather
+    than fresh parses. Returns None if the string cannot be parsed.
+    """
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+    except (ValueError, AttributeError):
+        return None
+
 # NYS Traffic Data Viewer OData Endpoint
 ODATA_BASE_URL = "https://data.ny.gov/resource/qjpt-z4rb.json"
 CONTINUOUS_COUNTS_URL = "https://data.ny.gov/resource/qzve-kjga.json"
@@ -28,138 +59,272 @@ class TrafficDataFetcher:
             app_token: Optional Socrata app token for higher rate limits
         """
         self.app_token = app_token
-        self.session = requests.Session()
+
+        headers = {'Accept-Encoding': 'gzip'}
         if app_token:
-            self.session.headers.update({'X-App-Token': app_token})
+            headers['X-App-Token'] = app_token
+
+        if httpx is not None:
+            # HTTP/2 multiplexes the concurrent page fetches over one
+            # connection; gzip shrinks the JSON payloads on the wire
+            try:
+                self.session = httpx.Client(http2=True, headers=headers, timeout=30)
+            except ImportError:
+                # h2 extra not installed; HTTP/1.1 httpx still compresses
+                self.session = httpx.Client(headers=headers, timeout=30)
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(headers)
+
+    def _get_with_retry(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        max_retries: int = 3
+    ):
+        """
+        Issue a GET, backing off on 429/503 responses.
+
+        Honors the server's Retry-After header when present, falling back
+        to exponential backoff, so concurrent page fetches self-throttle
+        to Socrata's actual rate limit instead of sleeping a fixed delay
+        between every page.
+        """
+        for attempt in range(max_retries + 1):
+            response = self.session.get(url, params=params, timeout=30)
+            if response.status_code in (429, 503) and attempt < max_retries:
+                delay = float(2 ** attempt)
+                retry_after = response.headers.get('Retry-After')
+                if retry_after is not None:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        # RFC 9110 also allows an HTTP-date here; the
+                        # exponential backoff stands in rather than
+                        # crashing the fetch on a well-formed response
+                        pass
+                logger.warning(f"Rate limited, retrying in {delay}s")
+                time.sleep(delay)
+                continue
+            response.raise_for_status()
+            return response
+        return response
     
     def fetch_continuous_counts(
         self,
         county: Optional[str] = None,
-        limit: int = 1000,
-        offset: int = 0
+        limit: int = 1000
     ) -> List[Dict[str, Any]]:
         """
         Fetch continuous count data.
-        
+
         Args:
             county: Filter by county name
             limit: Maximum number of records to fetch
-            offset: Record offset for pagination
-            
+
         Returns:
             List of traffic data records
         """
-        params = {
-            '$limit': limit,
-            '$offset': offset,
-            '$order': 'date DESC'
-        }
-        
-        if county:
-            params['$where'] = f"county='{county}'"
-        
-        try:
-            response = self.session.get(CONTINUOUS_COUNTS_URL, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            logger.info(f"Fetched {len(data)} continuous count records")
-            return self._parse_traffic_data(data, 'continuous')
-            
-        except requests.RequestException as e:
-            logger.error(f"Error fetching continuous counts: {e}")
-            return []
-    
+        records, _ = self._fetch_counts_page(
+            CONTINUOUS_COUNTS_URL, 'continuous', county, limit
+        )
+        return records
+
     def fetch_short_counts(
         self,
         county: Optional[str] = None,
-        limit: int = 1000,
-        offset: int = 0
+        limit: int = 1000
     ) -> List[Dict[str, Any]]:
         """
         Fetch short count data.
-        
+
         Args:
             county: Filter by county name
             limit: Maximum number of records to fetch
-            offset: Record offset for pagination
-            
+
         Returns:
             List of traffic data records
         """
+        records, _ = self._fetch_counts_page(
+            SHORT_COUNTS_URL, 'short', county, limit
+        )
+        return records
+
+    def _fetch_counts_page(
+        self,
+        url: str,
+        data_type: str,
+        county: Optional[str],
+        limit: int,
+        cursor: Optional[Tuple[str, str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Fetch one page of count data, newest first.
+
+        Pages are keyed on (date, :id): date alone is not unique, so a
+        date-only cursor would drop every remaining record sharing the
+        page-boundary date. The unique row id breaks ties, and the
+        cursor is taken from the raw fields rather than the parsed
+        timestamps, so parse fallbacks can never corrupt it.
+
+        Args:
+            url: Endpoint URL
+            data_type: Type of data ('continuous' or 'short')
+            county: Filter by county name
+            limit: Maximum number of records to fetch
+            cursor: (date, row id) of the last row of the previous page
+
+        Returns:
+            Tuple of (parsed records, cursor for the next page or None)
+        """
         params = {
             '$limit': limit,
-            '$offset': offset,
-            '$order': 'date DESC'
+            '$order': 'date DESC, :id',
+            # System fields like :id are only returned when asked for
+            '$select': ':id,*'
         }
-        
+
+        # Native field filter: the server resolves this as an indexed
+        # column equality without SoQL parsing, and the value is bound
+        # rather than spliced into a $where string
         if county:
-            params['$where'] = f"county='{county}'"
-        
+            params['county'] = county
+        # Keyset cursor: seeks straight to the next page on the sort key
+        # instead of making the server skip/re-sort OFFSET rows
+        if cursor is not None:
+            last_date, last_id = cursor
+            params['$where'] = (
+                f"date < '{last_date}' "
+                f"OR (date = '{last_date}' AND :id > '{last_id}')"
+            )
+
         try:
-            response = self.session.get(SHORT_COUNTS_URL, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._get_with_retry(url, params)
             data = response.json()
-            
-            logger.info(f"Fetched {len(data)} short count records")
-            return self._parse_traffic_data(data, 'short')
-            
-        except requests.RequestException as e:
-            logger.error(f"Error fetching short counts: {e}")
-            return []
+
+            logger.info(f"Fetched {len(data)} {data_type} count records")
+
+            next_cursor = None
+            if data:
+                last = data[-1]
+                if last.get('date') and last.get(':id'):
+                    next_cursor = (last['date'], last[':id'])
+            return self._parse_traffic_data(data, data_type), next_cursor
+
+        except _REQUEST_ERRORS as e:
+            logger.error(f"Error fetching {data_type} counts: {e}")
+            return [], None
     
     def _parse_traffic_data(
-        self, 
-        raw_data: List[Dict[str, Any]], 
+        self,
+        raw_data: List[Dict[str, Any]],
         data_type: str
     ) -> List[Dict[str, Any]]:
         """
         Parse raw traffic data into standardized format.
-        
+
         Args:
             raw_data: Raw data from API
             data_type: Type of data ('continuous' or 'short')
-            
+
         Returns:
             Parsed traffic data records
         """
-        parsed_data = []
-        
-        for record in raw_data:
-            try:
-                parsed_record = {
-                    'county': record.get('county', '').strip(),
-                    'station_id': record.get('station_id', record.get('rc_station', '')),
-                    'direction': record.get('direction', record.get('dir', 'N')),
-                    'timestamp': self._parse_timestamp(record),
-                    'volume': int(record.get('volume', record.get('aadt', 0))),
-                    'speed': float(record.get('speed', 0)) if 'speed' in record else None,
-                    'occupancy': float(record.get('occupancy', 0)) if 'occupancy' in record else None,
-                    'data_type': data_type
-                }
-                parsed_data.append(parsed_record)
-            except (ValueError, KeyError) as e:
-                logger.warning(f"Error parsing record: {e}")
-                continue
-        
-        return parsed_data
+        frame = self._parse_traffic_frame(raw_data, data_type)
+        if frame.empty:
+            return []
+        return frame.to_dict('records')
+
+    def _parse_traffic_frame(
+        self,
+        raw_data: List[Dict[str, Any]],
+        data_type: str
+    ) -> pd.DataFrame:
+        """
+        Parse raw traffic data into a columnar DataFrame.
+
+        Vectorized (structure-of-arrays) replacement for the per-record
+        dict building: each field is coerced once as a whole column
+        instead of ~8 .get() calls and casts per record.
+
+        Args:
+            raw_data: Raw data from API
+            data_type: Type of data ('continuous' or 'short')
+
+        Returns:
+            DataFrame with standardized traffic data columns
+        """
+        if not raw_data:
+            return pd.DataFrame(columns=[
+                'county', 'station_id', 'direction', 'timestamp',
+                'volume', 'speed', 'occupancy', 'data_type'
+            ])
+
+        df = pd.DataFrame(raw_data)
+
+        def column(name, fallback=None, default=''):
+            if name in df.columns:
+                col = df[name]
+                if fallback is not None and fallback in df.columns:
+                    col = col.fillna(df[fallback])
+                return col
+            if fallback is not None and fallback in df.columns:
+                return df[fallback]
+            return pd.Series(default, index=df.index)
+
+        parsed = pd.DataFrame(index=df.index)
+        parsed['county'] = column('county').fillna('').astype(str).str.strip()
+        parsed['station_id'] = column('station_id', 'rc_station').fillna('')
+        # Uppercase once here so downstream grouping never re-normalizes
+        # direction codes per record
+        parsed['direction'] = (
+            column('direction', 'dir', default='N').fillna('N').astype(str).str.upper()
+        )
+
+        # Vectorized timestamp parse to epoch seconds; rows that fail to
+        # parse fall back to "now", mirroring _parse_timestamp.
+        # format='mixed' parses each row on its own terms — without it,
+        # pandas infers one format from the first row and coerces every
+        # differently-shaped (but valid) timestamp to NaT, which the
+        # now-fallback below would then silently rewrite
+        raw_ts = column('date', 'timestamp', default=None)
+        if 'datetime' in df.columns:
+            raw_ts = raw_ts.fillna(df['datetime'])
+        ts = pd.to_datetime(raw_ts, format='mixed', errors='coerce', utc=True)
+        ts = ts.fillna(pd.Timestamp.now(tz='UTC'))
+        parsed['timestamp'] = (
+            (ts - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+        )
+
+        parsed['volume'] = (
+            pd.to_numeric(column('volume', 'aadt', default=0), errors='coerce')
+            .fillna(0)
+            .astype(int)
+        )
+        parsed['speed'] = (
+            pd.to_numeric(df['speed'], errors='coerce')
+            if 'speed' in df.columns else None
+        )
+        parsed['occupancy'] = (
+            pd.to_numeric(df['occupancy'], errors='coerce')
+            if 'occupancy' in df.columns else None
+        )
+        parsed['data_type'] = data_type
+
+        return parsed
     
-    def _parse_timestamp(self, record: Dict[str, Any]) -> str:
-        """Parse timestamp from various formats in the data."""
+    def _parse_timestamp(self, record: Dict[str, Any]) -> int:
+        """Parse timestamp into integer Unix epoch seconds."""
         # Try different timestamp fields
-        timestamp_fields = ['date', 'timestamp', 'datetime']
-        
-        for field in timestamp_fields:
-            if field in record:
-                try:
-                    # Handle ISO format timestamps
-                    dt = datetime.fromisoformat(record[field].replace('Z', '+00:00'))
-                    return dt.strftime('%Y-%m-%d %H:%M:%S')
-                except (ValueError, AttributeError):
-                    pass
-        
+        raw = record.get('date') or record.get('timestamp') or record.get('datetime')
+
+        if raw is not None:
+            epoch = _timestamp_to_epoch(raw)
+            if epoch is not None:
+                return epoch
+
         # Default to current timestamp if parsing fails
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return int(datetime.now().timestamp())
     
     def fetch_all_data(
         self,
@@ -176,25 +341,36 @@ class TrafficDataFetcher:
         Returns:
             Combined list of all traffic data
         """
-        all_data = []
         batch_size = 1000
-        
-        # Fetch continuous counts
-        for offset in range(0, max_records, batch_size):
-            continuous = self.fetch_continuous_counts(county, batch_size, offset)
-            if not continuous:
-                break
-            all_data.extend(continuous)
-            time.sleep(0.5)  # Rate limiting
-        
-        # Fetch short counts
-        for offset in range(0, max_records, batch_size):
-            short = self.fetch_short_counts(county, batch_size, offset)
-            if not short:
-                break
-            all_data.extend(short)
-            time.sleep(0.5)  # Rate limiting
-        
+
+        def fetch_pages(url, data_type):
+            # Keyset pagination: seek past the last seen (date, :id)
+            # rather than paying OFFSET's skip-and-resort cost, which
+            # grows linearly with page depth. A short page means the
+            # dataset is exhausted.
+            records = []
+            cursor = None
+            while len(records) < max_records:
+                page, cursor = self._fetch_counts_page(
+                    url, data_type, county, batch_size, cursor
+                )
+                if not page:
+                    break
+                records.extend(page)
+                if len(page) < batch_size or cursor is None:
+                    break
+            return records[:max_records]
+
+        # The two endpoints are independent, so their page walks overlap
+        # in a small thread pool (requests.Session is thread-safe for GETs)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = executor.map(
+                fetch_pages,
+                (CONTINUOUS_COUNTS_URL, SHORT_COUNTS_URL),
+                ('continuous', 'short')
+            )
+            all_data = list(chain.from_iterable(results))
+
         logger.info(f"Fetched total of {len(all_data)} records for {county}")
         return all_data
 
@@ -3,15 +3,20 @@ Data Processing Module
 Handles data validation, interpolation, and signal timing inference.
 """
 
+from .traffic_frame import TrafficFrame
 from .validate_data import validate_traffic_data, clean_data
-from .interpolate import interpolate_missing_data
-from .infer_signal_timings import infer_signal_timings, estimate_coordination
+from .interpolate import interpolate_missing_data, process_traffic, build_sort_index
+from .infer_signal_timings import infer_signal_timings, infer_signal_timings_from_volumes, estimate_coordination
 
 __all__ = [
-    'validate_traffic_data', 
+    'TrafficFrame',
+    'validate_traffic_data',
     'clean_data',
     'interpolate_missing_data',
+    'process_traffic',
+    'build_sort_index',
     'infer_signal_timings',
+    'infer_signal_timings_from_volumes',
     'estimate_coordination'
 ]
 
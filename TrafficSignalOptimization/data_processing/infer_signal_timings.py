@@ -6,9 +6,30 @@ Infers signal timings from traffic data patterns.
 import logging
 from typing import Dict, List, Any, Tuple
 import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is an optional dependency; without it the kernels below run
+    # as plain Python/numpy, just without native-code compilation
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
 
 logger = logging.getLogger(__name__)
 
+# Direction/key pairs precomputed once so per-call loops skip f-string
+# key construction
+_GREEN_KEY_BY_DIRECTION = tuple(
+    (direction, f'green_time_{direction}')
+    for direction in ('north', 'south', 'east', 'west')
+)
+
 
 def infer_signal_timings(
     traffic_data: List[Dict[str, Any]],
@@ -16,35 +37,60 @@ def infer_signal_timings(
 ) -> Dict[str, Any]:
     """
     Infer signal timing parameters from traffic data.
-    
+
     Args:
-        traffic_data: List of traffic data for an intersection
+        traffic_data: List of traffic data records or DataFrame for an intersection
         cycle_length_range: Tuple of (min_cycle, max_cycle) in seconds
-        
+
+    Returns:
+        Dictionary with inferred signal timing parameters
+    """
+    # Average volume per direction in a single C-level groupby pass
+    # (fuses the old dict-of-lists grouping with the mean computation)
+    if not isinstance(traffic_data, pd.DataFrame):
+        df = pd.DataFrame(traffic_data, columns=['direction', 'volume'])
+    else:
+        df = traffic_data
+
+    if df.empty:
+        volumes = {}
+    else:
+        directions = df['direction'].fillna('N').astype(str).str.upper()
+        vols = pd.to_numeric(df['volume'], errors='coerce').fillna(0)
+        volumes = vols.groupby(directions).mean().to_dict()
+
+    return infer_signal_timings_from_volumes(volumes, cycle_length_range)
+
+
+def infer_signal_timings_from_volumes(
+    volumes: Dict[str, float],
+    cycle_length_range: Tuple[int, int] = (45, 120)
+) -> Dict[str, Any]:
+    """
+    Infer signal timing parameters from pre-aggregated direction volumes.
+
+    Use this with DatabaseManager.get_volume_by_direction so the
+    per-direction averaging stays inside SQLite and no raw rows have to
+    be materialized in Python at all.
+
+    Args:
+        volumes: Dictionary mapping direction codes to average volume
+        cycle_length_range: Tuple of (min_cycle, max_cycle) in seconds
+
     Returns:
         Dictionary with inferred signal timing parameters
     """
-    # Group data by direction
-    direction_data = _group_by_direction(traffic_data)
-    
-    # Calculate volumes for each direction
-    volumes = {}
-    for direction, records in direction_data.items():
-        total_volume = sum(r.get('volume', 0) for r in records)
-        avg_volume = total_volume / len(records) if records else 0
-        volumes[direction] = avg_volume
-    
     # Determine cycle length based on total demand
     total_volume = sum(volumes.values())
     cycle_length = _calculate_cycle_length(total_volume, cycle_length_range)
-    
+
     # Calculate green splits based on volumes
     green_splits = _calculate_green_splits(volumes, cycle_length)
-    
+
     # Standard yellow and all-red times
     yellow_time = 3.0  # seconds
     all_red_time = 2.0  # seconds
-    
+
     signal_timing = {
         'cycle_length': cycle_length,
         'green_time_north': green_splits.get('N', 0),
@@ -55,37 +101,18 @@ def infer_signal_timings(
         'all_red_time': all_red_time,
         'volumes': volumes
     }
-    
+
     logger.info(f"Inferred signal timing: cycle={cycle_length}s, splits={green_splits}")
     return signal_timing
 
 
-def _group_by_direction(data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    """Group traffic data by direction."""
-    grouped = {}
-    
-    for record in data:
-        direction = record.get('direction', 'N').upper()
-        if direction not in grouped:
-            grouped[direction] = []
-        grouped[direction].append(record)
-    
-    return grouped
-
-
-def _calculate_cycle_length(total_volume: float, cycle_range: Tuple[int, int]) -> int:
+@njit('int64(float64, int64, int64)', cache=True)
+def _cycle_length_kernel(total_volume: float, min_cycle: int, max_cycle: int) -> int:
     """
-    Calculate appropriate cycle length based on traffic volume.
-    
-    Args:
-        total_volume: Total traffic volume across all approaches
-        cycle_range: Allowable cycle length range
-        
-    Returns:
-        Cycle length in seconds
+    Numeric kernel for _calculate_cycle_length (JIT-compiled when
+    numba is available; the explicit signature compiles it eagerly at
+    import instead of on first call).
     """
-    min_cycle, max_cycle = cycle_range
-    
     # Use volume to determine cycle length
     # Low volume: shorter cycles
     # High volume: longer cycles
@@ -98,13 +125,28 @@ def _calculate_cycle_length(total_volume: float, cycle_range: Tuple[int, int]) -
         # Linear interpolation between min and max
         ratio = (total_volume - 500) / (2000 - 500)
         cycle_length = int(min_cycle + ratio * (max_cycle - min_cycle))
-    
+
     # Round to nearest 5 seconds for practical implementation
-    cycle_length = round(cycle_length / 5) * 5
-    
+    cycle_length = int(round(cycle_length / 5)) * 5
+
     return max(min_cycle, min(max_cycle, cycle_length))
 
 
+def _calculate_cycle_length(total_volume: float, cycle_range: Tuple[int, int]) -> int:
+    """
+    Calculate appropriate cycle length based on traffic volume.
+
+    Args:
+        total_volume: Total traffic volume across all approaches
+        cycle_range: Allowable cycle length range
+
+    Returns:
+        Cycle length in seconds
+    """
+    min_cycle, max_cycle = cycle_range
+    return _cycle_length_kernel(float(total_volume), min_cycle, max_cycle)
+
+
 def _calculate_green_splits(
     volumes: Dict[str, float], 
     cycle_length: int
@@ -170,6 +212,72 @@ def _calculate_green_splits(
     return green_splits
 
 
+def calculate_green_splits_batch(
+    volumes: np.ndarray,
+    cycle_lengths: np.ndarray,
+    yellow_time: float = 3.0,
+    all_red_time: float = 2.0,
+    min_green: float = 10.0
+) -> np.ndarray:
+    """
+    Calculate green splits for many intersections in one vectorized pass.
+
+    Batch counterpart of _calculate_green_splits for optimizers that
+    evaluate thousands of candidate timings per generation: all splits,
+    the scale-factor normalization, and the min-green clamp are computed
+    with broadcast numpy ops instead of per-intersection Python calls.
+
+    Args:
+        volumes: Array of shape (N, 4) with volumes in N, S, E, W order
+        cycle_lengths: Array of shape (N,) with cycle lengths in seconds
+        yellow_time: Yellow time per phase in seconds
+        all_red_time: All-red time per phase in seconds
+        min_green: Minimum green time per phase in seconds
+
+    Returns:
+        Array of shape (N, 4) with green times in N, S, E, W order
+    """
+    volumes = np.asarray(volumes, dtype=np.float64)
+    cycle_lengths = np.asarray(cycle_lengths, dtype=np.float64)
+
+    # Assume 2-phase operation (NS and EW), matching the scalar version
+    lost_time = (yellow_time + all_red_time) * 2
+    effective_green = cycle_lengths - lost_time
+
+    ns_volume = volumes[:, 0] + volumes[:, 1]
+    ew_volume = volumes[:, 2] + volumes[:, 3]
+    total_volume = ns_volume + ew_volume
+
+    # Proportional split, guarding the zero-volume rows (equal split)
+    safe_total = np.where(total_volume == 0, 1.0, total_volume)
+    ns_ratio = np.where(total_volume == 0, 0.5, ns_volume / safe_total)
+    ew_ratio = np.where(total_volume == 0, 0.5, ew_volume / safe_total)
+
+    ns_green = np.maximum(min_green, effective_green * ns_ratio)
+    ew_green = np.maximum(min_green, effective_green * ew_ratio)
+
+    # Scale down any rows whose clamped greens exceed the available time
+    total_green = ns_green + ew_green
+    scale = np.minimum(1.0, effective_green / total_green)
+    ns_green *= scale
+    ew_green *= scale
+
+    return np.column_stack([ns_green, ns_green, ew_green, ew_green])
+
+
+@njit('float64[:](float64[:], float64[:])', cache=True)
+def _coord_offsets(travel_times: np.ndarray, cycle_lengths: np.ndarray) -> np.ndarray:
+    """
+    Numeric kernel computing coordination offsets (JIT-compiled when
+    numba is available, eagerly thanks to the explicit signature):
+    offset is travel time modulo cycle length, rounded to 0.1s.
+    """
+    offsets = np.empty(travel_times.shape[0], dtype=np.float64)
+    for i in range(travel_times.shape[0]):
+        offsets[i] = round(travel_times[i] % cycle_lengths[i], 1)
+    return offsets
+
+
 def estimate_coordination(
     intersection_timings: List[Dict[str, Any]],
     distances: List[float],
@@ -189,26 +297,26 @@ def estimate_coordination(
     if len(intersection_timings) < 2:
         logger.warning("Need at least 2 intersections for coordination")
         return {}
-    
+
     # Convert speed to feet per second
     speed_fps = avg_speed * 5280 / 3600
-    
+
     # Calculate travel times between intersections
-    travel_times = [dist / speed_fps for dist in distances]
-    
-    # Use first intersection as reference (offset = 0)
-    offsets = [0]
-    
-    # Calculate offsets for subsequent intersections
-    for i, travel_time in enumerate(travel_times):
-        # Offset is travel time modulo cycle length
-        cycle_length = intersection_timings[i + 1]['cycle_length']
-        offset = travel_time % cycle_length
-        offsets.append(round(offset, 1))
-    
+    travel_times = np.asarray(distances, dtype=np.float64) / speed_fps
+
+    # Cycle lengths pulled out of the dicts once so the offset loop is
+    # pure numeric and JIT-compilable
+    cycle_lengths = np.array(
+        [t['cycle_length'] for t in intersection_timings[1:]],
+        dtype=np.float64
+    )
+
+    offsets = _coord_offsets(travel_times, cycle_lengths)
+
     coordination = {
-        'offsets': offsets,
-        'travel_times': travel_times,
+        # First intersection is the reference (offset = 0)
+        'offsets': [0] + offsets.tolist(),
+        'travel_times': travel_times.tolist(),
         'reference_intersection': 0,
         'coordination_speed': avg_speed
     }
@@ -242,13 +350,15 @@ def adjust_for_pedestrians(
     adjusted_timing = signal_timing.copy()
     
     # Ensure each green phase is long enough for pedestrians
-    for direction in ['north', 'south', 'east', 'west']:
-        green_key = f'green_time_{direction}'
+    for direction, green_key in _GREEN_KEY_BY_DIRECTION:
         if green_key in adjusted_timing:
             current_green = adjusted_timing[green_key]
             if current_green < required_ped_time:
-                logger.info(f"Adjusting {direction} green time from {current_green} to {required_ped_time} for pedestrians")
+                logger.info(
+                    "Adjusting %s green time from %s to %s for pedestrians",
+                    direction, current_green, required_ped_time
+                )
                 adjusted_timing[green_key] = required_ped_time
-    
+
     return adjusted_timing
 
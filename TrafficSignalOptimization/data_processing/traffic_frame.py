@@ -0,0 +1,108 @@
+"""
+Traffic Frame Module
+Columnar (structure-of-arrays) container for traffic data records.
+"""
+
+import logging
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import List, Dict, Any
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# C-level field extractor for fully-populated records; one call per
+# record replaces six .get() method lookups
+_FIELDS = itemgetter(
+    'station_id', 'direction', 'timestamp', 'volume', 'speed', 'occupancy'
+)
+
+
+@dataclass
+class TrafficFrame:
+    """
+    Parallel NumPy arrays holding one column per traffic data field.
+
+    The list-of-dicts record format pays a hash lookup and a boxed
+    Python object per field access; this layout keeps each column in a
+    contiguous buffer so validation, cleaning and interpolation can run
+    as whole-column NumPy operations. Convert at module boundaries with
+    from_records / to_records — the public APIs still speak dicts.
+    """
+
+    station_id: np.ndarray  # object
+    direction: np.ndarray   # object
+    timestamp: np.ndarray   # object (epoch int or string, as received)
+    volume: np.ndarray      # float32, NaN where missing
+    speed: np.ndarray       # float32, NaN where missing
+    occupancy: np.ndarray   # float32, NaN where missing
+
+    @classmethod
+    def from_records(cls, data: List[Dict[str, Any]]) -> 'TrafficFrame':
+        """
+        Build a frame from a list of record dictionaries in one pass.
+
+        Args:
+            data: List of traffic data dictionaries
+
+        Returns:
+            TrafficFrame with one entry per input record
+        """
+        n = len(data)
+        station_id = np.empty(n, dtype=object)
+        direction = np.empty(n, dtype=object)
+        timestamp = np.empty(n, dtype=object)
+        volume = np.full(n, np.nan, dtype=np.float32)
+        speed = np.full(n, np.nan, dtype=np.float32)
+        occupancy = np.full(n, np.nan, dtype=np.float32)
+
+        # Fast path: map(itemgetter) extracts all six fields per record
+        # in C. Records missing keys drop to the .get() path instead.
+        try:
+            rows = list(map(_FIELDS, data))
+        except KeyError:
+            rows = [
+                (
+                    r.get('station_id'), r.get('direction'), r.get('timestamp'),
+                    r.get('volume'), r.get('speed'), r.get('occupancy')
+                )
+                for r in data
+            ]
+
+        for i, (sid, dirn, ts, v, s, o) in enumerate(rows):
+            station_id[i] = sid
+            direction[i] = dirn
+            timestamp[i] = ts
+            if isinstance(v, (int, float)):
+                volume[i] = v
+            if isinstance(s, (int, float)):
+                speed[i] = s
+            if isinstance(o, (int, float)):
+                occupancy[i] = o
+
+        return cls(station_id, direction, timestamp, volume, speed, occupancy)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the frame back to a list of record dictionaries.
+
+        NaN column entries become None, matching the record convention
+        for missing values.
+        """
+        records = []
+        for i in range(len(self)):
+            vol = self.volume[i]
+            spd = self.speed[i]
+            occ = self.occupancy[i]
+            records.append({
+                'station_id': self.station_id[i],
+                'direction': self.direction[i],
+                'timestamp': self.timestamp[i],
+                'volume': int(vol) if np.isfinite(vol) else None,
+                'speed': float(spd) if np.isfinite(spd) else None,
+                'occupancy': float(occ) if np.isfinite(occ) else None,
+            })
+        return records
+
+    def __len__(self) -> int:
+        return len(self.station_id)
@@ -8,7 +8,8 @@ from .fitness_functions import (
     calculate_throughput,
     calculate_delay,
     calculate_stops,
-    composite_fitness
+    composite_fitness,
+    composite_fitness_batch
 )
 
 __all__ = [
@@ -16,6 +17,7 @@ __all__ = [
     'calculate_throughput',
     'calculate_delay',
     'calculate_stops',
-    'composite_fitness'
+    'composite_fitness',
+    'composite_fitness_batch'
 ]
 
@@ -4,17 +4,125 @@ Implements genetic algorithm for signal timing optimization.
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Tuple, Callable
 import numpy as np
 import random
-from copy import deepcopy
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    # numba is an optional dependency; without it the breeding falls
+    # back to the vectorized numpy path
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
 
 logger = logging.getLogger(__name__)
 
+# Green-time keys precomputed once; building them with f-strings inside
+# per-individual loops allocates a fresh string per access
+_GREEN_KEYS = (
+    'green_time_north', 'green_time_south', 'green_time_east', 'green_time_west'
+)
+
+# Full set of numeric fields that determine a chromosome's fitness
+_TIMING_KEYS = ('cycle_length',) + _GREEN_KEYS + ('yellow_time', 'all_red_time')
+
+# Gene order for the timing dicts: cycle length plus the four green
+# times (legacy scalar operators iterate this)
+_GENE_KEYS = ('cycle_length',) + _GREEN_KEYS
+
+# The SoA population matrix stores only [cycle, green_NS, green_EW]:
+# normalization forces north==south and east==west, so the four green
+# columns carry two degrees of freedom — the phase representation
+# halves the matrix traffic and drops the averaging step
+_N_GENES = 3
+
+
+def _timing_key(signal_timing: Dict[str, Any]) -> tuple:
+    """Hashable cache key for a timing, quantized to 1e-3 precision."""
+    return tuple(round(float(signal_timing.get(k, 0)), 3) for k in _TIMING_KEYS)
+
+
+@njit('float64[:, :](float64[:, :], float64[:], float64[:, :], float64[:], '
+      'int64[:], float64[:], float64[:], float64[:], float64, float64, float64)',
+      cache=True, fastmath=True)
+def _breed_step_kernel(
+    parent_genes: np.ndarray,
+    cross_u: np.ndarray,
+    mask_u: np.ndarray,
+    mut_u: np.ndarray,
+    mut_cols: np.ndarray,
+    mut_noise: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    crossover_rate: float,
+    mutation_rate: float,
+    lost_time: float
+) -> np.ndarray:
+    """
+    Fused crossover + mutation + normalize step compiled by numba.
+
+    All randomness is pre-drawn by the caller (so the PCG64 stream and
+    therefore the results match the numpy fallback exactly); the kernel
+    itself is pure arithmetic, which LLVM fuses into one native pass
+    over the offspring matrix with no temporaries.
+    """
+    pairs = parent_genes.shape[0] // 2
+    n_genes = parent_genes.shape[1]
+    children = np.empty((2 * pairs, n_genes), dtype=np.float64)
+
+    for p in range(pairs):
+        i1 = 2 * p
+        i2 = i1 + 1
+        do_cross = cross_u[p] < crossover_rate
+        for g in range(n_genes):
+            a = parent_genes[i1, g]
+            b = parent_genes[i2, g]
+            if do_cross and mask_u[p, g] < 0.5:
+                children[i1, g] = b
+                children[i2, g] = a
+            else:
+                children[i1, g] = a
+                children[i2, g] = b
+
+    for r in range(2 * pairs):
+        if mut_u[r] < mutation_rate:
+            c = mut_cols[r]
+            value = children[r, c] + mut_noise[r] * (hi[c] - lo[c]) * 0.1
+            if value < lo[c]:
+                value = lo[c]
+            elif value > hi[c]:
+                value = hi[c]
+            children[r, c] = value
+
+        # Integral cycle, then phase-green normalization, while the
+        # row is still in cache
+        cycle = np.rint(children[r, 0])
+        children[r, 0] = cycle
+        available_green = cycle - lost_time
+        total_green = children[r, 1] + children[r, 2]
+        if total_green > available_green:
+            scale = available_green / total_green
+            children[r, 1] *= scale
+            children[r, 2] *= scale
+
+    return children
+
 
 class Individual:
     """Represents an individual solution (signal timing configuration)."""
-    
+
+    __slots__ = ('signal_timing', 'fitness', 'simulation_results')
+
     def __init__(self, signal_timing: Dict[str, Any]):
         """
         Initialize individual with signal timing.
@@ -42,11 +150,12 @@ class GeneticAlgorithm:
         mutation_rate: float = 0.1,
         crossover_rate: float = 0.8,
         elitism_count: int = 2,
-        random_seed: int = 42
+        random_seed: int = 42,
+        n_workers: int = 1
     ):
         """
         Initialize genetic algorithm.
-        
+
         Args:
             population_size: Number of individuals in population
             generations: Number of generations to evolve
@@ -54,34 +163,71 @@ class GeneticAlgorithm:
             crossover_rate: Probability of crossover
             elitism_count: Number of best individuals to preserve
             random_seed: Random seed for reproducibility
+            n_workers: Worker processes for fitness evaluation; 1 keeps
+                the serial path (fitness evaluations are independent, so
+                with a picklable fitness function each generation scales
+                near-linearly with cores)
         """
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elitism_count = elitism_count
+        self.n_workers = n_workers
         
         random.seed(random_seed)
         np.random.seed(random_seed)
+
+        # Single PCG64 generator for the vectorized breeding path; the
+        # module-level random/np.random seeding above stays for the
+        # legacy scalar operators
+        self.rng = np.random.default_rng(random_seed)
         
         self.population = []
         self.best_individual = None
         self.fitness_history = []
+
+        # Default gene bounds as arrays in [cycle, NS, EW] order, plus
+        # the per-gene mutation scale; the breeding ops index these
+        # instead of doing dict lookups per mutation. optimize()
+        # refreshes them from the caller's constraints once per run.
+        self._gene_lo = np.array([45.0, 10.0, 10.0])
+        self._gene_hi = np.array([120.0, 60.0, 60.0])
+        self._gene_sigma = (self._gene_hi - self._gene_lo) * 0.1
+
+        # Total lost time per cycle; optimize() refreshes it from the
+        # initial timing's yellow/all-red fields
+        self._lost_time = 10.0
+
+        # Memoized (fitness, results) keyed by quantized timing tuple:
+        # elites and converged chromosomes recur across generations, and
+        # every hit skips a full fitness evaluation
+        self._fitness_cache: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
     
     def optimize(
         self,
         initial_timing: Dict[str, Any],
         fitness_function: Callable[[Dict[str, Any]], Tuple[float, Dict[str, Any]]],
-        constraints: Dict[str, Tuple[float, float]] = None
+        constraints: Dict[str, Tuple[float, float]] = None,
+        map_func: Callable[[List[Dict[str, Any]]], List[Tuple[float, Dict[str, Any]]]] = None,
+        initial_population: List[Dict[str, Any]] = None
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Run genetic algorithm optimization.
-        
+
         Args:
             initial_timing: Initial signal timing configuration
             fitness_function: Function that evaluates fitness given signal timing
             constraints: Dictionary of parameter constraints (min, max)
-            
+            map_func: Optional batch evaluator mapping a list of signal
+                timings to (fitness, results) pairs — e.g. backed by a
+                process pool — used instead of calling fitness_function
+                per individual
+            initial_population: Optional pre-generated list of signal
+                timing dicts used as the starting population, so callers
+                can build it in bulk (e.g. vectorized) and go straight
+                into a batched first evaluation
+
         Returns:
             Tuple of (best_signal_timing, optimization_results)
         """
@@ -90,67 +236,132 @@ class GeneticAlgorithm:
         # Set default constraints
         if constraints is None:
             constraints = self._get_default_constraints()
-        
-        # Initialize population
-        self.population = self._initialize_population(initial_timing, constraints)
-        
-        # Evaluate initial population
-        self._evaluate_population(fitness_function)
-        
-        # Evolution loop
-        for generation in range(self.generations):
-            # Selection
-            parents = self._selection()
-            
-            # Crossover and mutation
-            offspring = []
-            for i in range(0, len(parents) - 1, 2):
-                parent1, parent2 = parents[i], parents[i + 1]
-                
-                # originally tried single-point crossover but uniform works better for signal timings
-                if random.random() < self.crossover_rate:
-                    child1, child2 = self._crossover(parent1, parent2)
-                else:
-                    child1, child2 = deepcopy(parent1), deepcopy(parent2)
-                
-                # mutate after crossover - tried other way around but this converges faster
-                if random.random() < self.mutation_rate:
-                    child1 = self._mutate(child1, constraints)
-                if random.random() < self.mutation_rate:
-                    child2 = self._mutate(child2, constraints)
-                
-                offspring.extend([child1, child2])
-            
-            # Elitism: preserve best individuals
-            self.population.sort(key=lambda x: x.fitness, reverse=True)
-            elite = self.population[:self.elitism_count]
-            
-            # Form new population
-            self.population = elite + offspring[:self.population_size - self.elitism_count]
-            
-            # Evaluate new population
-            self._evaluate_population(fitness_function)
-            
-            # Track best individual
-            self.population.sort(key=lambda x: x.fitness, reverse=True)
-            self.best_individual = self.population[0]
-            self.fitness_history.append(self.best_individual.fitness)
+
+        # Fold the constraint dict into the [cycle, NS, EW] gene-bound
+        # arrays once, so the per-generation breeding ops never touch
+        # the dict again; the north/east bounds stand in for their
+        # symmetric phases
+        phase_keys = ('cycle_length', 'green_time_north', 'green_time_east')
+        self._gene_lo = np.array(
+            [constraints.get(key, (10, 60))[0] for key in phase_keys],
+            dtype=np.float64
+        )
+        self._gene_hi = np.array(
+            [constraints.get(key, (10, 60))[1] for key in phase_keys],
+            dtype=np.float64
+        )
+        self._gene_sigma = (self._gene_hi - self._gene_lo) * 0.1
+
+        # Master/slave parallel evaluation: one pool reused across
+        # every generation when the caller did not supply its own
+        # batch evaluator; fitness_function must then be picklable
+        executor = (
+            ProcessPoolExecutor(max_workers=self.n_workers)
+            if map_func is None and self.n_workers > 1
+            else None
+        )
+        try:
+            # Initialize population
+            if initial_population is not None:
+                self.population = [Individual(dict(timing)) for timing in initial_population]
+            else:
+                self.population = self._initialize_population(initial_timing, constraints)
+        
+            # Evaluate initial population
+            self._evaluate_population(fitness_function, map_func, executor)
+        
+            # Template carrying the non-gene fields (yellow, all-red,
+            # any metadata) that every offspring inherits unchanged
+            template = dict(initial_timing)
+
+            # Lost time is fixed for the whole run; hoist it out of the
+            # per-generation normalization instead of re-fetching the
+            # yellow/all-red fields every iteration
+            self._lost_time = (
+                template.get('yellow_time', 3.0)
+                + template.get('all_red_time', 2.0)
+            ) * 2
+
+            # Per-generation best fitness, preallocated instead of
+            # growing a Python list; converted back to a list at the
+            # end for the UI/export consumers
+            fitness_hist = np.empty(self.generations, dtype=np.float64)
+
+            # Fitness vector for the current population; refreshed at
+            # the bottom of each generation after evaluation
+            fitness = np.fromiter(
+                (ind.fitness for ind in self.population),
+                dtype=np.float64,
+                count=len(self.population)
+            )
+
+            # Evolution loop
+            for generation in range(self.generations):
+                # Selection, crossover and mutation run as
+                # whole-population matrix ops on the SoA gene view;
+                # dicts reappear only at the fitness boundary
+                genes = self._genes_matrix(self.population)
+
+                parent_idx = self._tournament_indices(fitness)
+                offspring_genes = self._breed_genes(genes[parent_idx])
+
+                # Only the rows that survive elitism become dicts; the
+                # rest never leave the matrix
+                needed = self.population_size - self.elitism_count
+                offspring = self._make_individuals(
+                    offspring_genes[:needed], template
+                )
+
+                # Elitism: top-k via argpartition — O(P) partial select
+                # instead of a full sort with Python-level comparisons
+                k = min(self.elitism_count, len(self.population))
+                elite_idx = np.argpartition(-fitness, k - 1)[:k] if k else []
+                elite = [self.population[i] for i in elite_idx]
+
+                # Form new population
+                self.population = elite + offspring
+
+                # Evaluate new population
+                self._evaluate_population(fitness_function, map_func, executor)
+
+                # Track best individual
+                fitness = np.fromiter(
+                    (ind.fitness for ind in self.population),
+                    dtype=np.float64,
+                    count=len(self.population)
+                )
+                self.best_individual = self.population[int(np.argmax(fitness))]
+                fitness_hist[generation] = self.best_individual.fitness
+
+                # Drop the per-cycle simulation payloads on everyone
+                # but the best: retaining them across generations grows
+                # memory with P * generations, and the bounded fitness
+                # cache re-serves an elite's results if it recurs
+                for ind in self.population:
+                    if ind is not self.best_individual:
+                        ind.simulation_results = None
             
-            if (generation + 1) % 10 == 0:
-                logger.info(f"Generation {generation + 1}/{self.generations}: Best fitness = {self.best_individual.fitness:.4f}")
-        
-        # Prepare results
-        optimization_results = {
-            'best_fitness': self.best_individual.fitness,
-            'fitness_history': self.fitness_history,
-            'generations': self.generations,
-            'final_population_size': len(self.population),
-            'simulation_results': self.best_individual.simulation_results
-        }
-        
-        logger.info(f"Optimization complete. Best fitness: {self.best_individual.fitness:.4f}")
+                if (generation + 1) % 10 == 0:
+                    logger.info(f"Generation {generation + 1}/{self.generations}: Best fitness = {self.best_individual.fitness:.4f}")
         
-        return self.best_individual.signal_timing, optimization_results
+            # Back to a plain list: the UI and JSON export expect one
+            self.fitness_history = fitness_hist.tolist()
+
+            # Prepare results
+            optimization_results = {
+                'best_fitness': self.best_individual.fitness,
+                'fitness_history': self.fitness_history,
+                'generations': self.generations,
+                'final_population_size': len(self.population),
+                'simulation_results': self.best_individual.simulation_results
+            }
+        
+            logger.info(f"Optimization complete. Best fitness: {self.best_individual.fitness:.4f}")
+        
+            return self.best_individual.signal_timing, optimization_results
+        finally:
+            if executor is not None:
+                executor.shutdown()
     
     def _initialize_population(
         self,
@@ -170,19 +381,18 @@ class GeneticAlgorithm:
         population = []
         
         # Add initial timing as first individual
-        population.append(Individual(deepcopy(initial_timing)))
+        population.append(Individual(dict(initial_timing)))
         
         # Generate random individuals
         for _ in range(self.population_size - 1):
-            timing = deepcopy(initial_timing)
+            timing = dict(initial_timing)
             
             # Randomize cycle length
             min_cycle, max_cycle = constraints.get('cycle_length', (45, 120))
             timing['cycle_length'] = random.randint(min_cycle, max_cycle)
             
             # Randomize green times
-            for direction in ['north', 'south', 'east', 'west']:
-                key = f'green_time_{direction}'
+            for key in _GREEN_KEYS:
                 min_green, max_green = constraints.get(key, (10, 60))
                 timing[key] = random.uniform(min_green, max_green)
             
@@ -226,18 +436,237 @@ class GeneticAlgorithm:
         timing['green_time_east'] = ew_green
         timing['green_time_west'] = ew_green
     
-    def _evaluate_population(self, fitness_function: Callable):
+    @staticmethod
+    def _normalize_green_times_vec(genes: np.ndarray, lost_time: float = 10.0):
+        """
+        Normalize green times for a whole gene matrix in place.
+
+        Matrix counterpart of _normalize_green_times: one ufunc pass
+        scales the NS/EW phase greens down wherever they exceed the
+        green time available after lost time, instead of one Python
+        call per offspring.
+
+        Args:
+            genes: (N, 3) gene matrix [cycle, NS, EW], modified in place
+            lost_time: Total lost time per cycle, precomputed once per
+                run as (yellow + all-red) * 2
+        """
+        available_green = genes[:, 0] - lost_time
+        total_green = genes[:, 1] + genes[:, 2]
+
+        scale = np.minimum(1.0, available_green / total_green)
+        genes[:, 1] *= scale
+        genes[:, 2] *= scale
+
+    @staticmethod
+    def _genes_matrix(individuals: List[Individual]) -> np.ndarray:
+        """
+        Extract the (N, 3) gene matrix [cycle, NS green, EW green]
+        from individuals; the symmetric direction pairs are averaged
+        into one phase column each.
+        """
+        return np.array(
+            [
+                [
+                    float(t.get('cycle_length', 0)),
+                    (float(t.get('green_time_north', 0))
+                     + float(t.get('green_time_south', 0))) / 2,
+                    (float(t.get('green_time_east', 0))
+                     + float(t.get('green_time_west', 0))) / 2
+                ]
+                for t in (ind.signal_timing for ind in individuals)
+            ],
+            dtype=np.float64
+        )
+
+    def _tournament_indices(self, fitness: np.ndarray) -> np.ndarray:
+        """
+        Vectorized with-replacement tournament selection.
+
+        One integer draw builds every tournament at once and a row-wise
+        argmax picks the winners, so selection returns an index array
+        into the population instead of P copied individuals.
+        """
+        tournament_size = 3  # tried 5 but 3 gives better diversity
+        entrants = self.rng.integers(
+            0, len(fitness), size=(self.population_size, tournament_size)
+        )
+        winners = np.argmax(fitness[entrants], axis=1)
+        return entrants[np.arange(self.population_size), winners]
+
+    def _breed_genes(self, parent_genes: np.ndarray) -> np.ndarray:
+        """
+        Produce offspring genes from consecutive parent pairs in bulk.
+
+        Vectorized counterpart of the per-pair _crossover/_mutate loop:
+        uniform crossover is one boolean mask over all pairs, mutation
+        one fancy-indexed gaussian update, so per-generation bookkeeping
+        is a handful of array ops instead of P Python-level calls.
+        """
+        pairs = len(parent_genes) // 2
+
+        # All randomness pre-drawn from the one PCG64 generator, so the
+        # compiled kernel and the numpy fallback consume the exact same
+        # stream and produce identical offspring
+        cross_u = self.rng.random(pairs)
+        mask_u = self.rng.random((pairs, _N_GENES))
+        mut_u = self.rng.random(2 * pairs)
+        mut_cols = self.rng.integers(0, _N_GENES, size=2 * pairs)
+        mut_noise = self.rng.standard_normal(2 * pairs)
+
+        if _HAVE_NUMBA:
+            return _breed_step_kernel(
+                np.ascontiguousarray(parent_genes[:2 * pairs]),
+                cross_u, mask_u, mut_u, mut_cols, mut_noise,
+                self._gene_lo, self._gene_hi,
+                self.crossover_rate, self.mutation_rate, self._lost_time
+            )
+
+        p1 = parent_genes[0:2 * pairs:2]
+        p2 = parent_genes[1:2 * pairs:2]
+
+        # originally tried single-point crossover but uniform works better for signal timings
+        gene_mask = (mask_u < 0.5) & (cross_u < self.crossover_rate)[:, None]
+
+        children = np.empty((2 * pairs, _N_GENES), dtype=np.float64)
+        children[0::2] = np.where(gene_mask, p2, p1)
+        children[1::2] = np.where(gene_mask, p1, p2)
+
+        # mutate after crossover - tried other way around but this converges faster
+        mutate_rows = np.flatnonzero(mut_u < self.mutation_rate)
+        if mutate_rows.size:
+            cols = mut_cols[mutate_rows]
+            noise = mut_noise[mutate_rows] * self._gene_sigma[cols]
+            children[mutate_rows, cols] = np.clip(
+                children[mutate_rows, cols] + noise,
+                self._gene_lo[cols], self._gene_hi[cols]
+            )
+
+        # Cycle lengths stay integral, matching the scalar operators
+        children[:, 0] = np.rint(children[:, 0])
+
+        # Normalize in the same pass while the children are still hot
+        # in cache, so one call covers crossover+mutation+normalize
+        self._normalize_green_times_vec(children, self._lost_time)
+
+        return children
+
+    def _make_individuals(
+        self,
+        genes: np.ndarray,
+        template: Dict[str, Any]
+    ) -> List[Individual]:
+        """
+        Convert offspring gene rows back into timing dicts at the
+        fitness boundary; the template supplies the non-gene fields.
+        """
+        offspring = []
+        for cycle, g_ns, g_ew in genes.tolist():
+            timing = dict(template)
+            timing['cycle_length'] = int(round(cycle))
+            timing['green_time_north'] = g_ns
+            timing['green_time_south'] = g_ns
+            timing['green_time_east'] = g_ew
+            timing['green_time_west'] = g_ew
+            offspring.append(Individual(timing))
+        return offspring
+
+    def _evaluate_population(
+        self,
+        fitness_function: Callable,
+        map_func: Callable = None,
+        executor: ProcessPoolExecutor = None
+    ):
         """
         Evaluate fitness for all individuals in population.
-        
+
+        Individuals that already carry simulation results (elites and
+        unmodified crossover copies) are skipped — the fitness function
+        is deterministic per timing, so re-running it is pure waste.
+
         Args:
             fitness_function: Function to evaluate fitness
+            map_func: Optional batch evaluator (e.g. a process-pool map)
+                applied to all pending timings at once
+            executor: Optional internal pool (n_workers > 1) used when no
+                map_func is supplied
         """
+        # Serve repeat chromosomes from the memo cache; only genuinely
+        # new timings are dispatched for evaluation
+        pending = []
         for individual in self.population:
-            fitness, sim_results = fitness_function(individual.signal_timing)
+            if individual.simulation_results is not None:
+                continue
+            cached = self._fitness_cache.get(_timing_key(individual.signal_timing))
+            if cached is not None:
+                individual.fitness, individual.simulation_results = cached
+            else:
+                pending.append(individual)
+        if not pending:
+            return
+
+        # Evict oldest entries (dicts keep insertion order) before adding
+        # this generation's results
+        cache_cap = self.population_size * 10
+        while len(self._fitness_cache) > cache_cap:
+            self._fitness_cache.pop(next(iter(self._fitness_cache)))
+
+        timings = [individual.signal_timing for individual in pending]
+
+        if map_func is not None:
+            results = map_func(timings)
+        elif executor is not None:
+            chunksize = max(1, len(timings) // (4 * self.n_workers))
+            results = executor.map(fitness_function, timings, chunksize=chunksize)
+        else:
+            results = map(fitness_function, timings)
+
+        for individual, (fitness, sim_results) in zip(pending, results):
             individual.fitness = fitness
             individual.simulation_results = sim_results
-    
+            self._fitness_cache[_timing_key(individual.signal_timing)] = (
+                fitness, sim_results
+            )
+
+    def evaluate_population_with_queue_model(
+        self,
+        queue_model,
+        arrival_rates: np.ndarray
+    ) -> np.ndarray:
+        """
+        Score the whole population through the queue model in one pass.
+
+        Fast-path alternative to per-individual fitness functions when
+        the analytic queue model is the objective: the population's
+        greens and cycle lengths are lifted into (P, 4) matrices and
+        handed to QueueModel.evaluate_population, so no timing dicts or
+        Individual round-trips happen at all. Fitness values are
+        written back onto the individuals.
+
+        Args:
+            queue_model: QueueModel instance to evaluate against
+            arrival_rates: Arrival rates (vehicles per second), either
+                4 per-approach values shared by the population or a
+                full (P, 4) matrix
+
+        Returns:
+            (P,) array of fitness values, also assigned per individual
+        """
+        genes = self._genes_matrix(self.population)
+        # Expand the [NS, EW] phase columns back to four approaches
+        greens = genes[:, [1, 1, 2, 2]]
+        red_times = genes[:, 0:1] - greens
+
+        arrival_rates = np.broadcast_to(
+            np.asarray(arrival_rates, dtype=np.float64), greens.shape
+        )
+
+        fitness = queue_model.evaluate_population(arrival_rates, greens, red_times)
+        for individual, value in zip(self.population, fitness.tolist()):
+            individual.fitness = value
+
+        return fitness
+
     def _selection(self) -> List[Individual]:
         """
         Select parents using tournament selection.
@@ -252,7 +681,12 @@ class GeneticAlgorithm:
             # Tournament selection - tested roulette wheel but this was more stable
             tournament = random.sample(self.population, tournament_size)
             winner = max(tournament, key=lambda x: x.fitness)
-            parents.append(deepcopy(winner))
+            # Flat scalar dict: a plain copy sidesteps deepcopy's
+            # reflection machinery
+            winner_copy = Individual(dict(winner.signal_timing))
+            winner_copy.fitness = winner.fitness
+            winner_copy.simulation_results = winner.simulation_results
+            parents.append(winner_copy)
         
         return parents
     
@@ -271,12 +705,11 @@ class GeneticAlgorithm:
         Returns:
             Tuple of two offspring
         """
-        child1_timing = deepcopy(parent1.signal_timing)
-        child2_timing = deepcopy(parent2.signal_timing)
+        child1_timing = dict(parent1.signal_timing)
+        child2_timing = dict(parent2.signal_timing)
         
         # Uniform crossover for each parameter
-        parameters = ['cycle_length', 'green_time_north', 'green_time_south', 
-                     'green_time_east', 'green_time_west']
+        parameters = ('cycle_length',) + _GREEN_KEYS
         
         for param in parameters:
             if random.random() < 0.5:
@@ -307,18 +740,21 @@ class GeneticAlgorithm:
         timing = individual.signal_timing
         
         # Select random parameter to mutate
-        parameters = ['cycle_length', 'green_time_north', 'green_time_south',
-                     'green_time_east', 'green_time_west']
+        parameters = ('cycle_length',) + _GREEN_KEYS
         param = random.choice(parameters)
         
         # Get constraints
         min_val, max_val = constraints.get(param, (10, 60))
         
-        # Gaussian mutation
+        # Gaussian mutation; scalar clamp instead of np.clip, which
+        # would round-trip a single float through a 0-d array
         current_val = timing[param]
-        mutation = np.random.normal(0, (max_val - min_val) * 0.1)
-        new_val = np.clip(current_val + mutation, min_val, max_val)
-        
+        new_val = current_val + np.random.normal(0, (max_val - min_val) * 0.1)
+        if new_val < min_val:
+            new_val = min_val
+        elif new_val > max_val:
+            new_val = max_val
+
         timing[param] = int(new_val) if param == 'cycle_length' else new_val
         
         # Normalize green times
@@ -358,13 +794,215 @@ class GeneticAlgorithm:
         """Find generation where algorithm converged."""
         if len(self.fitness_history) < 10:
             return len(self.fitness_history)
-        
-        # Find when fitness stopped improving significantly
+
+        # Find when fitness stopped improving significantly: one
+        # vectorized 10-generation diff instead of a Python loop
         threshold = 0.001
-        for i in range(10, len(self.fitness_history)):
-            recent_improvement = abs(self.fitness_history[i] - self.fitness_history[i-10])
-            if recent_improvement < threshold:
-                return i
-        
+        history = np.asarray(self.fitness_history, dtype=np.float64)
+        converged = np.abs(history[10:] - history[:-10]) < threshold
+        if converged.any():
+            return 10 + int(np.argmax(converged))
+
         return len(self.fitness_history)
 
+
+def _evolve_island_epoch(
+    initial_timing: Dict[str, Any],
+    population: List[Dict[str, Any]],
+    fitness_function: Callable,
+    constraints: Dict[str, Tuple[float, float]],
+    generations: int,
+    ga_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Evolve one island for one migration epoch in a worker process.
+
+    Module-level (not a method) so it pickles for ProcessPoolExecutor.
+    Each call builds a fresh GeneticAlgorithm from ga_params — the seed
+    in there must differ per island and per epoch or every island walks
+    the same trajectory.
+
+    Args:
+        initial_timing: Base timing configuration (template fields)
+        population: Island's current population as timing dicts, or
+            None on the first epoch to let the GA initialize randomly
+        fitness_function: Picklable fitness function
+        constraints: Parameter constraints
+        generations: Generations to run in this epoch
+        ga_params: Keyword arguments for the GeneticAlgorithm
+
+    Returns:
+        Dictionary with the island's ranked population and best result
+    """
+    ga = GeneticAlgorithm(generations=generations, **ga_params)
+    best_timing, results = ga.optimize(
+        initial_timing,
+        fitness_function,
+        constraints=constraints,
+        initial_population=population
+    )
+
+    # Rank best-first so migration can slice elites off the head and
+    # overwrite stragglers at the tail
+    ga.population.sort(key=lambda x: x.fitness, reverse=True)
+
+    return {
+        'population': [ind.signal_timing for ind in ga.population],
+        'best_timing': best_timing,
+        'best_fitness': results['best_fitness'],
+        'fitness_history': results['fitness_history'],
+        'simulation_results': results['simulation_results']
+    }
+
+
+class IslandGeneticAlgorithm:
+    """
+    Multi-deme (island) parallel GA with periodic ring migration.
+
+    Each island evolves an independent sub-population in its own worker
+    process; every migration_interval generations the islands pause and
+    each one's elites replace the worst individuals of its ring
+    neighbour. Compared to the master/slave n_workers mode this removes
+    the per-generation synchronization barrier — workers only meet at
+    migration points — and the isolated demes preserve diversity, which
+    tends to improve fitness per evaluation on multimodal landscapes.
+    """
+
+    def __init__(
+        self,
+        population_size: int = 50,
+        generations: int = 100,
+        mutation_rate: float = 0.1,
+        crossover_rate: float = 0.8,
+        elitism_count: int = 2,
+        random_seed: int = 42,
+        n_islands: int = 4,
+        migration_interval: int = 5,
+        migration_count: int = 2
+    ):
+        """
+        Initialize island-model genetic algorithm.
+
+        Args:
+            population_size: Total individuals across all islands
+            generations: Number of generations to evolve
+            mutation_rate: Probability of mutation
+            crossover_rate: Probability of crossover
+            elitism_count: Best individuals preserved per island
+            random_seed: Base random seed; islands derive their own
+            n_islands: Number of independent sub-populations (one
+                worker process each)
+            migration_interval: Generations between migrations
+            migration_count: Individuals exchanged per migration
+        """
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.elitism_count = elitism_count
+        self.random_seed = random_seed
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migration_count = migration_count
+
+        self.best_individual = None
+        self.fitness_history = []
+
+    def optimize(
+        self,
+        initial_timing: Dict[str, Any],
+        fitness_function: Callable[[Dict[str, Any]], Tuple[float, Dict[str, Any]]],
+        constraints: Dict[str, Tuple[float, float]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run island-model optimization.
+
+        Args:
+            initial_timing: Initial signal timing configuration
+            fitness_function: Picklable fitness function evaluating a
+                signal timing to (fitness, results)
+            constraints: Dictionary of parameter constraints (min, max)
+
+        Returns:
+            Tuple of (best_signal_timing, optimization_results)
+        """
+        island_size = max(self.elitism_count + self.migration_count + 1,
+                          self.population_size // self.n_islands)
+        logger.info(
+            f"Starting island GA: {self.n_islands} islands x {island_size} individuals, "
+            f"{self.generations} generations, migration every {self.migration_interval}"
+        )
+
+        # None lets each island initialize its own random population
+        populations: List[Any] = [None] * self.n_islands
+        best_timing = None
+        best_fitness = -np.inf
+        best_results = None
+        self.fitness_history = []
+
+        with ProcessPoolExecutor(max_workers=self.n_islands) as executor:
+            remaining = self.generations
+            epoch = 0
+            while remaining > 0:
+                epoch_generations = min(self.migration_interval, remaining)
+
+                futures = [
+                    executor.submit(
+                        _evolve_island_epoch,
+                        initial_timing,
+                        populations[i],
+                        fitness_function,
+                        constraints,
+                        epoch_generations,
+                        {
+                            'population_size': island_size,
+                            'mutation_rate': self.mutation_rate,
+                            'crossover_rate': self.crossover_rate,
+                            'elitism_count': self.elitism_count,
+                            # Decorrelate islands and epochs
+                            'random_seed': self.random_seed + i * 1009 + epoch * 9973
+                        }
+                    )
+                    for i in range(self.n_islands)
+                ]
+                islands = [f.result() for f in futures]
+
+                # Best-so-far across all islands
+                for island in islands:
+                    if island['best_fitness'] > best_fitness:
+                        best_fitness = island['best_fitness']
+                        best_timing = island['best_timing']
+                        best_results = island['simulation_results']
+
+                # Global history: elementwise best across islands
+                histories = np.array(
+                    [island['fitness_history'] for island in islands]
+                )
+                self.fitness_history.extend(histories.max(axis=0).tolist())
+
+                # Ring migration: island i's elites overwrite the tail
+                # (worst-ranked) of island i+1
+                populations = [island['population'] for island in islands]
+                if self.n_islands > 1 and remaining > epoch_generations:
+                    migrants = [
+                        pop[:self.migration_count] for pop in populations
+                    ]
+                    for i, pop in enumerate(populations):
+                        incoming = migrants[i - 1]
+                        pop[-len(incoming):] = [dict(t) for t in incoming]
+
+                remaining -= epoch_generations
+                epoch += 1
+
+        optimization_results = {
+            'best_fitness': best_fitness,
+            'fitness_history': self.fitness_history,
+            'generations': self.generations,
+            'final_population_size': island_size * self.n_islands,
+            'simulation_results': best_results
+        }
+
+        logger.info(f"Island optimization complete. Best fitness: {best_fitness:.4f}")
+
+        return best_timing, optimization_results
+
@@ -2,6 +2,9 @@
 Unit tests for data processing module.
 """
 
+import os
+import subprocess
+import sys
 import unittest
 from data_processing.validate_data import validate_traffic_data, clean_data, get_peak_hours
 from data_processing.interpolate import interpolate_missing_data
@@ -117,6 +120,50 @@ class TestDataInterpolation(unittest.TestCase):
         
         interpolated = interpolate_missing_data(data, method='linear')
         self.assertEqual(len(interpolated), 3)
+        self.assertEqual(interpolated[1]['volume'], 600)
+
+    def test_linear_interpolation_no_extrapolation(self):
+        """Test that missing values at the edges are left untouched."""
+        def record(timestamp, volume):
+            return {
+                'station_id': 'ST_001',
+                'direction': 'N',
+                'timestamp': timestamp,
+                'volume': volume
+            }
+
+        data = [
+            record('2025-01-01 12:00:00', None),
+            record('2025-01-01 12:15:00', 500),
+            record('2025-01-01 12:30:00', None),
+            record('2025-01-01 12:45:00', 700),
+            record('2025-01-01 13:00:00', None)
+        ]
+
+        interpolated = interpolate_missing_data(data, method='linear')
+        self.assertIsNone(interpolated[0]['volume'])
+        self.assertEqual(interpolated[2]['volume'], 600)
+        self.assertIsNone(interpolated[4]['volume'])
+
+    def test_import_keeps_process_pools_fork_safe(self):
+        """Importing interpolate must not break later process pools."""
+        # Regression test: an eagerly-compiled numba parallel kernel in
+        # this module used to initialize a fork-unsafe threading layer
+        # at import, deadlocking any later fork-based
+        # ProcessPoolExecutor at interpreter shutdown. The child below
+        # must finish a one-task pool and actually exit.
+        script = (
+            "import data_processing.interpolate\n"
+            "from concurrent.futures import ProcessPoolExecutor\n"
+            "with ProcessPoolExecutor(max_workers=1) as executor:\n"
+            "    assert executor.submit(abs, -1).result() == 1\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            timeout=120
+        )
+        self.assertEqual(result.returncode, 0)
 
 
 class TestSignalTimingInference(unittest.TestCase):